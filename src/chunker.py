@@ -12,7 +12,19 @@ Splits markdown/HTML content into retrieval-friendly chunks with:
 import hashlib
 import re
 from dataclasses import dataclass
-from html.parser import HTMLParser
+
+import lxml.html
+from lxml import etree
+
+# RE2 matches in linear time, so pathological markup can't trigger
+# catastrophic backtracking in the cleaning patterns (links, images, code
+# fences).  It is only used for those: on the other, simpler patterns
+# stdlib re is several times faster.  RE2 doesn't accept the stdlib flag
+# constants, so the cleaning patterns use inline flags.
+try:
+    import re2 as _regex
+except ImportError:
+    _regex = re
 
 
 @dataclass
@@ -29,26 +41,33 @@ class Chunk:
 # ---------------------------------------------------------------------------
 
 def _strip_html(text: str) -> str:
-    class _Extractor(HTMLParser):
-        def __init__(self):
-            super().__init__()
-            self.parts: list[str] = []
+    """Return the text content of *text* with whitespace collapsed."""
+    if not text.strip():
+        return ""
+    try:
+        root = lxml.html.fromstring(text)
+    except etree.ParserError:
+        return ""  # nothing but comments / processing instructions
+    return " ".join(" ".join(root.itertext()).split())
 
-        def handle_data(self, data: str) -> None:
-            self.parts.append(data)
 
-    parser = _Extractor()
-    parser.feed(text)
-    return " ".join(parser.parts)
+_FRONTMATTER_RE = re.compile(r"\A---\s*\n.*?\n---\s*\n", re.DOTALL)
+_HTML_TAG_RE = re.compile(r"<[^>]+>")
+_IMAGE_RE = _regex.compile(r"!\[([^\]]*)\]\([^)]*\)")
+_LINK_RE = _regex.compile(r"\[([^\]]*)\]\([^)]*\)")
+_CODE_FENCE_RE = _regex.compile(r"(?s)```[^\n]*\n(.*?)```")
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
 
 
 def _clean_markdown(text: str) -> str:
-    text = re.sub(r"^---\s*\n.*?\n---\s*\n", "", text, flags=re.DOTALL)
-    text = re.sub(r"<[^>]+>", " ", text)
-    text = re.sub(r"!\[([^\]]*)\]\([^)]*\)", r"\1", text)
-    text = re.sub(r"\[([^\]]*)\]\([^)]*\)", r"\1", text)
-    text = re.sub(r"```[^\n]*\n(.*?)```", r"\1", text, flags=re.DOTALL)
-    text = re.sub(r"\n{3,}", "\n\n", text)
+    text = _FRONTMATTER_RE.sub("", text)
+    text = _HTML_TAG_RE.sub(" ", text)
+    # Images before links, so a linked image [![alt](img)](url) is reduced
+    # to [alt](url) and then to its alt text.
+    text = _IMAGE_RE.sub(r"\1", text)
+    text = _LINK_RE.sub(r"\1", text)
+    text = _CODE_FENCE_RE.sub(r"\1", text)
+    text = _BLANK_LINES_RE.sub("\n\n", text)
     return text.strip()
 
 
@@ -56,6 +75,9 @@ def _clean_markdown(text: str) -> str:
 # Section splitting with breadcrumb tracking
 # ---------------------------------------------------------------------------
 
+_HEADER_RE = re.compile(r"^(#{1,3})[ \t]+(.+)$", re.MULTILINE)
+
+
 def _split_by_headers(text: str) -> list[tuple[str, str, str]]:
     """
     Split on markdown headers; returns [(header, body, breadcrumb), ...].
@@ -63,14 +85,16 @@ def _split_by_headers(text: str) -> list[tuple[str, str, str]]:
     The breadcrumb is a " > "-joined path like "Setup > Installation > Docker"
     that tracks the H1/H2/H3 nesting hierarchy.
     """
-    header_re = re.compile(r"^(#{1,3})\s+(.+)$", re.MULTILINE)
+    # The substring test is far cheaper than a failed multiline search.
+    if "#" not in text or not _HEADER_RE.search(text):
+        return [("", text.strip(), "")]
+
     sections: list[tuple[str, str, str]] = []
 
     # Track headers at each level for breadcrumb
     level_headers: dict[int, str] = {}
     current_header = ""
-    current_level = 0
-    current_lines: list[str] = []
+    pos = 0
 
     def _breadcrumb() -> str:
         parts = []
@@ -79,26 +103,22 @@ def _split_by_headers(text: str) -> list[tuple[str, str, str]]:
                 parts.append(level_headers[lvl])
         return " > ".join(parts)
 
-    for line in text.splitlines():
-        m = header_re.match(line)
-        if m:
-            body = "\n".join(current_lines).strip()
-            if body:
-                sections.append((current_header, body, _breadcrumb()))
-
-            level = len(m.group(1))
-            title = m.group(2).strip()
-            current_header = title
-            current_level = level
-            level_headers[level] = title
-            for lvl in list(level_headers):
-                if lvl > level:
-                    del level_headers[lvl]
-            current_lines = []
-        else:
-            current_lines.append(line)
-
-    body = "\n".join(current_lines).strip()
+    # Section bodies are sliced straight out of *text* between header matches.
+    for m in _HEADER_RE.finditer(text):
+        body = text[pos:m.start()].strip()
+        if body:
+            sections.append((current_header, body, _breadcrumb()))
+
+        level = len(m.group(1))
+        title = m.group(2).strip()
+        current_header = title
+        level_headers[level] = title
+        for lvl in list(level_headers):
+            if lvl > level:
+                del level_headers[lvl]
+        pos = m.end()
+
+    body = text[pos:].strip()
     if body:
         sections.append((current_header, body, _breadcrumb()))
 
@@ -220,7 +240,12 @@ def chunk_page(
 
     Args:
         content:          Raw page content (markdown or HTML).
-        content_type:     ``"markdown"`` or ``"html"`` (case-insensitive).
+        content_type:     ``"markdown"``, ``"html"`` or ``"clean-markdown"``
+                          (case-insensitive).  ``"clean-markdown"`` is
+                          markdown with nothing to strip (no links, images
+                          or tags), e.g. converted from a scraped page; it
+                          is split on headers like markdown but not cleaned,
+                          so literal ``<``/``>`` text survives.
         chunk_size:       Maximum words per chunk.
         chunk_overlap:    Words shared between consecutive chunks.
         page_title:       Page title (used to build enriched context).
@@ -229,10 +254,12 @@ def chunk_page(
     Returns:
         Ordered list of :class:`Chunk` objects.
     """
-    if content_type.lower() == "html":
+    content_type = content_type.lower()
+    if content_type == "html":
         text = _strip_html(content)
-        text = re.sub(r"\s{2,}", " ", text).strip()
         sections = [("", text, "")]
+    elif content_type == "clean-markdown":
+        sections = _split_by_headers(content.strip())
     else:
         text = _clean_markdown(content)
         sections = _split_by_headers(text)
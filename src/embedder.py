@@ -7,11 +7,19 @@ Set OLLAMA_URL, EMBEDDING_MODEL, and optionally OLLAMA_API_KEY in your environme
 
 import logging
 import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 import httpx
+import numpy as np
+
+from http_retry import retry_after
 
 logger = logging.getLogger(__name__)
 
+_NUMBER_RE = re.compile(r"-?\d+(?:\.\d+)?")
+
 
 class OllamaEmbedder:
     _DEFAULT_MODEL = "nomic-embed-text"
@@ -24,17 +32,29 @@ class OllamaEmbedder:
         timeout: float = 120.0,
         context_length: int = _DEFAULT_CONTEXT_LENGTH,
         api_key: str | None = None,
+        max_concurrency: int = 4,
+        max_retries: int = 3,
+        retry_delay: float = 1.0,
+        keep_alive: str | float | None = None,
     ):
         self._model_name = model_name
         self._base_url = base_url.rstrip("/")
         headers = {"Authorization": f"Bearer {api_key}"} if api_key else None
         self._client = httpx.Client(headers=headers, timeout=timeout)
         self._context_length = context_length
+        self._max_concurrency = max(1, max_concurrency)
+        self._max_retries = max_retries
+        self._retry_delay = retry_delay
+        self._request = {"model": model_name}
+        if keep_alive is not None:
+            self._request["keep_alive"] = keep_alive
 
         logger.info(
             "Connecting to Ollama at %s (model=%s, context_length=%d, auth=%s)…",
             self._base_url, model_name, context_length, "enabled" if api_key else "disabled",
         )
+        # Besides finding the dimension, the probe makes Ollama load the
+        # model now rather than on the first real batch.
         probe = self._embed_batch(["dimension probe"])
         self._dim = len(probe[0])
         logger.info("Ollama embedder ready (dim=%d)", self._dim)
@@ -57,10 +77,22 @@ class OllamaEmbedder:
         return " ".join(words[:max_words])
 
     def _embed_batch(self, texts: list[str]) -> list[list[float]]:
-        resp = self._client.post(
-            f"{self._base_url}/api/embed",
-            json={"model": self._model_name, "input": texts},
-        )
+        for attempt in range(1, self._max_retries + 1):
+            resp = self._client.post(
+                f"{self._base_url}/api/embed",
+                json={**self._request, "input": texts},
+            )
+            retryable = resp.status_code == 429 or resp.status_code >= 500
+            if not retryable or attempt == self._max_retries:
+                break
+            delay = self._retry_delay * 2 ** (attempt - 1)
+            delay = max(delay, retry_after(resp) or 0.0)
+            logger.warning(
+                "Ollama returned HTTP %d on attempt %d/%d, retrying in %.1fs…",
+                resp.status_code, attempt, self._max_retries, delay,
+            )
+            time.sleep(delay)
+
         resp.raise_for_status()
         data = resp.json()
 
@@ -76,17 +108,52 @@ class OllamaEmbedder:
     def dimension(self) -> int:
         return self._dim
 
-    def encode(self, texts: list[str], batch_size: int = 32) -> list[list[float]]:
-        results: list[list[float]] = []
-        for i in range(0, len(texts), batch_size):
-            batch = [self._truncate(t) for t in texts[i : i + batch_size]]
-            results.extend(self._embed_batch(batch))
+    def encode(self, texts: list[str], batch_size: int = 32) -> np.ndarray:
+        """
+        Embed *texts*, returning a float32 array of shape (len(texts), dim).
+
+        Vectors stay in one contiguous array from here to the store instead
+        of as lists of boxed Python floats.
+        """
+        batches = [
+            [self._truncate(t) for t in texts[i : i + batch_size]]
+            for i in range(0, len(texts), batch_size)
+        ]
+        results = np.empty((len(texts), self._dim), dtype=np.float32)
+        workers = min(self._max_concurrency, len(batches))
+        if workers <= 1:
+            _fill_rows(results, map(self._embed_batch, batches))
+        else:
+            # Up to max_concurrency requests in flight; map() keeps order.
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                _fill_rows(results, pool.map(self._embed_batch, batches))
         return results
 
 
+def _fill_rows(out: np.ndarray, batches) -> None:
+    """Copy consecutive batches of vectors into the rows of *out*."""
+    offset = 0
+    for batch_vectors in batches:
+        out[offset:offset + len(batch_vectors)] = batch_vectors
+        offset += len(batch_vectors)
+
+
 def build_embedder() -> OllamaEmbedder:
     model = os.environ.get("EMBEDDING_MODEL", OllamaEmbedder._DEFAULT_MODEL)
     url = os.environ.get("OLLAMA_URL", "http://localhost:11434")
     api_key = os.environ.get("OLLAMA_API_KEY", "").strip() or None
     ctx = int(os.environ.get("EMBEDDING_CONTEXT_LENGTH", str(OllamaEmbedder._DEFAULT_CONTEXT_LENGTH)))
-    return OllamaEmbedder(model, base_url=url, context_length=ctx, api_key=api_key)
+    concurrency = int(os.environ.get("EMBEDDING_CONCURRENCY", "4"))
+    keep_alive: str | float | None = os.environ.get("EMBEDDING_KEEP_ALIVE", "").strip() or None
+    if keep_alive and _NUMBER_RE.fullmatch(keep_alive):
+        # Ollama takes a bare number as seconds (negative = forever) but
+        # only as a JSON number; strings must carry a unit ("30m", "-1m").
+        keep_alive = float(keep_alive) if "." in keep_alive else int(keep_alive)
+    return OllamaEmbedder(
+        model,
+        base_url=url,
+        context_length=ctx,
+        api_key=api_key,
+        max_concurrency=concurrency,
+        keep_alive=keep_alive,
+    )
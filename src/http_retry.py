@@ -0,0 +1,27 @@
+"""
+Shared helpers for retrying HTTP requests.
+"""
+
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+
+import httpx
+
+
+def retry_after(resp: httpx.Response) -> float | None:
+    """Seconds to wait according to a Retry-After header, if present."""
+    value = resp.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        # A "-0000" zone parses as naive; RFC 5322 still means UTC.
+        when = when.replace(tzinfo=UTC)
+    return max(0.0, (when - datetime.now(UTC)).total_seconds())
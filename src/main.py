@@ -11,13 +11,17 @@ Features:
   - Content hash per chunk for deduplication
 """
 
+import asyncio
 import logging
+import multiprocessing
 import os
 import sys
 import time
 import uuid
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from datetime import UTC, datetime
+from functools import partial
 
 from chunker import Chunk, chunk_page
 from embedder import build_embedder
@@ -98,14 +102,31 @@ def _build_context(
 # Payload builder with parent/prev/next references
 # ---------------------------------------------------------------------------
 
+def _build_page_payload(page: dict, page_url: str, total_chunks: int) -> dict:
+    """
+    Build the payload fields shared by every chunk of *page*.
+
+    Passed to the store once per page and merged into each point there,
+    rather than being repeated in every per-chunk dict.
+    """
+    return {
+        "page_path":    page["path"],
+        "page_title":   page.get("title") or "",
+        "page_url":     page_url,
+        "description":  page.get("description") or "",
+        "tags":         [t["tag"] for t in (page.get("tags") or [])],
+        "updated_at":   page.get("updatedAt") or "",
+        "total_chunks": total_chunks,
+    }
+
+
 def _build_payloads(
     chunks: list[Chunk],
     page: dict,
-    page_url: str,
     parent_chunk_size: int,
 ) -> list[dict]:
     """
-    Build payload dicts for each chunk.
+    Build the per-chunk payload dicts (see _build_page_payload for the rest).
 
     Assigns stable UUIDs per chunk and cross-references:
       - prev_chunk_id / next_chunk_id  for sequential traversal
@@ -114,8 +135,6 @@ def _build_payloads(
     """
     page_title = page.get("title") or ""
     page_description = page.get("description") or ""
-    tags = [t["tag"] for t in (page.get("tags") or [])]
-    updated_at = page.get("updatedAt") or ""
 
     chunk_ids = [str(uuid.uuid4()) for _ in chunks]
 
@@ -133,16 +152,9 @@ def _build_payloads(
             "section":            chunk.section,
             "section_breadcrumb": chunk.section_breadcrumb,
             "content_hash":       chunk.content_hash,
-            "page_path":          page["path"],
-            "page_title":         page_title,
-            "page_url":           page_url,
-            "description":        page_description,
-            "tags":               tags,
-            "updated_at":         updated_at,
             "prev_chunk_id":      chunk_ids[i - 1] if i > 0 else None,
             "next_chunk_id":      chunk_ids[i + 1] if i < len(chunks) - 1 else None,
             "parent_chunk_index": parent_idx,
-            "total_chunks":       len(chunks),
         }
         payloads.append(payload)
 
@@ -366,20 +378,29 @@ def run() -> None:
     api_key        = os.environ.get("WIKI_API_KEY", "").strip() or None
     qdrant_host    = _env("QDRANT_HOST", "qdrant")
     qdrant_port    = int(_env("QDRANT_PORT", "6333"))
+    qdrant_grpc    = int(_env("QDRANT_GRPC_PORT", "6334"))
+    prefer_grpc    = _env_bool("QDRANT_PREFER_GRPC", True)
     collection     = _env("QDRANT_COLLECTION", "wiki")
     chunk_size     = int(_env("CHUNK_SIZE", "256"))
     chunk_overlap  = int(_env("CHUNK_OVERLAP", "50"))
     batch_size     = int(_env("EMBEDDING_BATCH_SIZE", "32"))
-    page_delay     = float(_env("PAGE_DELAY_SECONDS", "0.1"))
     force_reingest = _env_bool("FORCE_REINGEST", False)
     parent_ratio   = int(_env("PARENT_CHUNK_RATIO", "4"))
+    chunk_workers  = int(_env("CHUNK_WORKERS", str(os.cpu_count() or 1)))
+    wiki_concurrency = int(_env("WIKI_CONCURRENCY", "8"))
+    wiki_batch_size  = int(_env("WIKI_BATCH_SIZE", "20"))
+    wiki_cache_path  = _env("WIKI_CACHE_PATH", "") or None
+    wiki_rate_limit  = float(_env("WIKI_RATE_LIMIT", "50"))
 
     embedder = build_embedder()
 
     logger.info("Connecting to Qdrant at %s:%d …", qdrant_host, qdrant_port)
     for attempt in range(1, 7):
         try:
-            store = VectorStore(qdrant_host, qdrant_port, collection, embedder.dimension)
+            store = VectorStore(
+                qdrant_host, qdrant_port, collection, embedder.dimension,
+                grpc_port=qdrant_grpc, prefer_grpc=prefer_grpc,
+            )
             break
         except Exception as exc:
             if attempt == 6:
@@ -388,94 +409,224 @@ def run() -> None:
             logger.warning("Qdrant not ready (attempt %d/6): %s – retrying in 5 s…", attempt, exc)
             time.sleep(5)
 
-    with WikiClient(wiki_url, api_key) as wiki:
-        logger.info("wiki2rag %s  –  fetching public page list from %s …", __version__, wiki_url)
-        try:
-            pages = wiki.list_public_pages()
-        except WikiClientError as exc:
-            logger.error("Failed to list pages: %s", exc)
-            sys.exit(1)
+    pages: list[dict] = []
+    ok = skipped = unchanged = errors = 0
+    collected_tags: Counter[str] = Counter()
+    page_extra: dict[int, dict] = {}
+
+    # The page loop is a four-stage pipeline – fetch → chunk → embed →
+    # store – connected by small bounded queues, so the wiki, the
+    # chunking pool, Ollama and Qdrant all work at the same time while
+    # no stage can run more than a few pages ahead of the next.  Each
+    # stage signals completion by putting None on its output queue.
 
-        if not pages:
-            logger.warning("No public pages found – nothing to do.")
-            return
+    async def _is_unchanged(meta: dict) -> bool:
+        if force_reingest:
+            return False
+        stored_ts = await asyncio.to_thread(store.get_page_updated_at, meta["id"])
+        wiki_ts = meta.get("updatedAt") or ""
+        return bool(stored_ts and wiki_ts and stored_ts == wiki_ts)
+
+    async def _fetch_stage(wiki: WikiClient, out: asyncio.Queue) -> None:
+        nonlocal skipped, unchanged, errors
 
         total = len(pages)
-        ok = skipped = unchanged = errors = 0
-        collected_tags: Counter[str] = Counter()
-        page_extra: dict[int, dict] = {}
-
-        for i, meta in enumerate(pages, 1):
-            page_id = meta["id"]
-            title   = meta.get("title") or meta.get("path") or str(page_id)
-            logger.info("[%d/%d] Processing page %d: %s", i, total, page_id, title)
-
-            # --- Incremental: skip if updatedAt hasn't changed ---
-            if not force_reingest:
-                stored_ts = store.get_page_updated_at(page_id)
-                wiki_ts = meta.get("updatedAt") or ""
-                if stored_ts and wiki_ts and stored_ts == wiki_ts:
-                    logger.debug("  Page %d unchanged (updatedAt=%s), skipping.", page_id, wiki_ts)
+        # Pages are fetched a window at a time, wiki_concurrency batched
+        # requests in flight, then handed on in list order.
+        window_size = wiki_concurrency * wiki_batch_size
+        for start in range(0, total, window_size):
+            window = pages[start:start + window_size]
+
+            # --- Incremental: skip pages whose updatedAt hasn't changed ---
+            stale = await asyncio.gather(*(_is_unchanged(m) for m in window))
+            # (position in pages, meta) for each page that needs fetching.
+            todo: list[tuple[int, dict]] = []
+            for i, (meta, is_unchanged) in enumerate(zip(window, stale), start + 1):
+                if is_unchanged:
+                    logger.debug(
+                        "  Page %d unchanged (updatedAt=%s), skipping.",
+                        meta["id"], meta.get("updatedAt"),
+                    )
                     unchanged += 1
-                    continue
+                else:
+                    todo.append((i, meta))
 
             try:
-                page = wiki.get_page(page_id, meta=meta)
-            except WikiClientError as exc:
-                logger.error("  Could not fetch page %d: %s", page_id, exc)
-                errors += 1
-                continue
+                results = await wiki.get_pages_bulk(
+                    [meta for _, meta in todo], concurrency=wiki_concurrency, batch_size=wiki_batch_size,
+                )
+            except Exception as exc:
+                # Count the window as failed rather than cancelling the pipeline.
+                results = [exc] * len(todo)
 
-            if not page or not (page.get("content") or "").strip():
-                logger.debug("  Page %d has no content, skipping.", page_id)
-                skipped += 1
-                continue
+            for (i, meta), page in zip(todo, results):
+                page_id = meta["id"]
+                title   = meta.get("title") or meta.get("path") or str(page_id)
+                logger.info("[%d/%d] Processing page %d: %s", i, total, page_id, title)
+
+                if isinstance(page, Exception):
+                    logger.error("  Could not fetch page %d: %s", page_id, page)
+                    errors += 1
+                    continue
+
+                if not page or not (page.get("content") or "").strip():
+                    logger.debug("  Page %d has no content, skipping.", page_id)
+                    skipped += 1
+                    continue
+
+                page_extra[page_id] = {
+                    "authorName": page.get("authorName") or "",
+                    "createdAt":  page.get("createdAt") or "",
+                }
+
+                for t in page.get("tags") or []:
+                    tag = t["tag"] if isinstance(t, dict) else t
+                    collected_tags[tag] += 1
 
-            page_extra[page_id] = {
-                "authorName": page.get("authorName") or "",
-                "createdAt":  page.get("createdAt") or "",
-            }
+                await out.put((page_id, page))
 
-            for t in page.get("tags") or []:
-                tag = t["tag"] if isinstance(t, dict) else t
-                collected_tags[tag] += 1
+    async def _chunk_stage(
+        pool: ProcessPoolExecutor, inp: asyncio.Queue, out: asyncio.Queue,
+    ) -> None:
+        nonlocal skipped, errors
 
+        loop = asyncio.get_running_loop()
+        while (item := await inp.get()) is not None:
+            page_id, page = item
             content_type = (page.get("contentType") or "markdown").lower()
-            chunks = chunk_page(
-                page["content"],
-                content_type=content_type,
-                chunk_size=chunk_size,
-                chunk_overlap=chunk_overlap,
-                page_title=page.get("title") or "",
-                page_description=page.get("description") or "",
-            )
+            try:
+                chunks = await loop.run_in_executor(pool, partial(
+                    chunk_page,
+                    page["content"],
+                    content_type=content_type,
+                    chunk_size=chunk_size,
+                    chunk_overlap=chunk_overlap,
+                    page_title=page.get("title") or "",
+                    page_description=page.get("description") or "",
+                ))
+            except Exception as exc:
+                logger.error("  Chunking failed for page %d: %s", page_id, exc)
+                errors += 1
+                continue
 
             if not chunks:
                 logger.debug("  Page %d produced no chunks, skipping.", page_id)
                 skipped += 1
                 continue
 
-            texts = [c.text for c in chunks]
+            await out.put((page_id, page, chunks))
+
+    async def _embed_stage(inp: asyncio.Queue, out: asyncio.Queue) -> None:
+        # Small pages are pooled so each embedding call carries a full
+        # batch rather than one page's handful of chunks.
+        buffered: list[tuple[int, dict, list[Chunk]]] = []
+        buffered_chunks = 0
+
+        async def _flush() -> None:
+            nonlocal errors
+
+            texts = [c.text for _, _, chunks in buffered for c in chunks]
             try:
-                vectors = embedder.encode(texts, batch_size=batch_size)
+                vectors = await asyncio.to_thread(
+                    embedder.encode, texts, batch_size=batch_size,
+                )
             except Exception as exc:
-                logger.error("  Embedding failed for page %d: %s", page_id, exc)
-                errors += 1
-                continue
+                for page_id, _, _ in buffered:
+                    logger.error("  Embedding failed for page %d: %s", page_id, exc)
+                errors += len(buffered)
+                return
+
+            offset = 0
+            for page_id, page, chunks in buffered:
+                await out.put((page_id, page, chunks, vectors[offset:offset + len(chunks)]))
+                offset += len(chunks)
+
+        while (item := await inp.get()) is not None:
+            buffered.append(item)
+            buffered_chunks += len(item[2])
+            if buffered_chunks >= batch_size:
+                await _flush()
+                buffered.clear()
+                buffered_chunks = 0
+
+        if buffered:
+            await _flush()
+
+    async def _store_stage(inp: asyncio.Queue) -> None:
+        nonlocal ok, errors
+
+        while (item := await inp.get()) is not None:
+            page_id, page, chunks, vectors = item
 
             page_url = f"{wiki_url.rstrip('/')}/{page['path'].lstrip('/')}"
-            payloads = _build_payloads(chunks, page, page_url, parent_ratio)
+            shared = _build_page_payload(page, page_url, len(chunks))
+            payloads = _build_payloads(chunks, page, parent_ratio)
 
             try:
-                store.upsert_page_chunks(page_id, vectors, payloads)
+                await asyncio.to_thread(
+                    store.upsert_page_chunks,
+                    page_id, vectors, payloads, shared_payload=shared,
+                )
             except Exception as exc:
                 logger.error("  Store failed for page %d: %s", page_id, exc)
                 errors += 1
                 continue
 
             ok += 1
-            if page_delay > 0:
-                time.sleep(page_delay)
+
+    async def _pipeline() -> bool:
+        nonlocal pages
+
+        async with WikiClient(
+            wiki_url, api_key, cache_path=wiki_cache_path, rate_limit=wiki_rate_limit,
+        ) as wiki:
+            logger.info("wiki2rag %s  –  fetching public page list from %s …", __version__, wiki_url)
+            pages = await wiki.list_public_pages()
+            if not pages:
+                return False
+
+            fetched: asyncio.Queue = asyncio.Queue(maxsize=4)
+            chunked: asyncio.Queue = asyncio.Queue(maxsize=4)
+            embedded: asyncio.Queue = asyncio.Queue(maxsize=4)
+
+            async def _fetch() -> None:
+                await _fetch_stage(wiki, fetched)
+                for _ in range(chunk_workers):
+                    await fetched.put(None)
+
+            async def _chunk(pool: ProcessPoolExecutor) -> None:
+                # One consumer per pool worker keeps every process busy.
+                await asyncio.gather(*(
+                    _chunk_stage(pool, fetched, chunked) for _ in range(chunk_workers)
+                ))
+                await chunked.put(None)
+
+            async def _embed() -> None:
+                await _embed_stage(chunked, embedded)
+                await embedded.put(None)
+
+            # Workers start lazily, after to_thread() has spawned threads in
+            # this process; forking then can deadlock, so use a forkserver.
+            with ProcessPoolExecutor(
+                max_workers=chunk_workers,
+                mp_context=multiprocessing.get_context("forkserver"),
+            ) as pool:
+                async with asyncio.TaskGroup() as tg:
+                    tg.create_task(_fetch())
+                    tg.create_task(_chunk(pool))
+                    tg.create_task(_embed())
+                    tg.create_task(_store_stage(embedded))
+        return True
+
+    try:
+        found_pages = asyncio.run(_pipeline())
+    except WikiClientError as exc:
+        logger.error("Failed to list pages: %s", exc)
+        sys.exit(1)
+
+    if not found_pages:
+        logger.warning("No public pages found – nothing to do.")
+        return
 
     # --- Ingest wiki-level metadata ---
     logger.info("Building wiki metadata chunks…")
@@ -7,12 +7,15 @@ Usage:
     python query.py "how do I reset my password?"
     python query.py --limit 10 --collection wiki "event manager setup"
     python query.py --show-text "access control list"
+    python query.py --serve < queries.txt
+    python query.py --json "backup schedule" | jq .page_url
 
 Docker:
     docker compose run --rm query "how do I reset my password?"
 """
 
 import argparse
+import json
 import os
 import sys
 import textwrap
@@ -80,6 +83,59 @@ def _format_result(rank: int, hit, show_text: bool, text_width: int) -> str:
     return "\n".join(lines)
 
 
+# ── Search ────────────────────────────────────────────────────────────────────
+
+def _search(client: QdrantClient, embedder, args, query_text: str) -> list:
+    query_vector = embedder.encode([query_text])[0].tolist()
+
+    # query_points() is the current API (qdrant-client >= 1.10);
+    # fall back to the legacy search() for older installs.
+    threshold = args.min_score if args.min_score > 0 else None
+    if hasattr(client, "query_points"):
+        response = client.query_points(
+            collection_name=args.collection,
+            query=query_vector,
+            limit=args.limit,
+            with_payload=True,
+            score_threshold=threshold,
+        )
+        return response.points
+    return client.search(
+        collection_name=args.collection,
+        query_vector=query_vector,
+        limit=args.limit,
+        with_payload=True,
+        score_threshold=threshold,
+    )
+
+
+def _print_results(args, query_text: str, hits: list) -> None:
+    if args.json:
+        # One object per line, no colour or wrapping, for piping into jq etc.
+        for rank, hit in enumerate(hits, 1):
+            print(json.dumps(
+                {"query": query_text, "rank": rank, "score": hit.score, **hit.payload},
+                ensure_ascii=False,
+            ))
+        sys.stdout.flush()
+        return
+
+    print()
+    print(f"  {bold('Query:')} {query_text}")
+    model_name = os.environ.get("EMBEDDING_MODEL", "nomic-embed-text")
+    print(f"  {dim(f'collection={args.collection}  model={model_name}  v{__version__}')}")
+    print()
+
+    if not hits:
+        print(dim("  No results found."))
+        print()
+        return
+
+    for rank, hit in enumerate(hits, 1):
+        print(_format_result(rank, hit, args.show_text, args.width))
+        print()
+
+
 # ── Main ──────────────────────────────────────────────────────────────────────
 
 def main() -> None:
@@ -95,7 +151,7 @@ def main() -> None:
               OLLAMA_URL         default: http://localhost:11434
         """),
     )
-    parser.add_argument("query", nargs="+", help="Search query text")
+    parser.add_argument("query", nargs="*", help="Search query text")
     parser.add_argument(
         "-l", "--limit",
         type=int,
@@ -129,65 +185,60 @@ def main() -> None:
         metavar="N",
         help="Terminal width for text wrapping (default: 100)",
     )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print one JSON object per result (query, rank, score and the "
+             "stored payload) instead of formatted text",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Keep the model and Qdrant connection open and read one query "
+             "per line from stdin until EOF",
+    )
     args = parser.parse_args()
 
-    query_text = " ".join(args.query)
+    if not args.query and not args.serve:
+        parser.error("a query is required unless --serve is given")
 
-    # ── Embed the query ───────────────────────────────────────────────────────
+    # ── Connect once; reused for every query in --serve mode ─────────────────
     try:
         embedder = build_embedder()
     except Exception as exc:
         print(f"Error loading embedding model: {exc}", file=sys.stderr)
         sys.exit(1)
 
-    vectors = embedder.encode([query_text])
-    query_vector = vectors[0]
-
-    # ── Query Qdrant ──────────────────────────────────────────────────────────
     host = os.environ.get("QDRANT_HOST", "localhost")
     port = int(os.environ.get("QDRANT_PORT", "6333"))
-
-    try:
-        client = QdrantClient(host=host, port=port)
-        # query_points() is the current API (qdrant-client >= 1.10);
-        # fall back to the legacy search() for older installs.
-        threshold = args.min_score if args.min_score > 0 else None
-        if hasattr(client, "query_points"):
-            response = client.query_points(
-                collection_name=args.collection,
-                query=query_vector,
-                limit=args.limit,
-                with_payload=True,
-                score_threshold=threshold,
-            )
-            hits = response.points
-        else:
-            hits = client.search(
-                collection_name=args.collection,
-                query_vector=query_vector,
-                limit=args.limit,
-                with_payload=True,
-                score_threshold=threshold,
-            )
-    except Exception as exc:
-        print(f"Qdrant error: {exc}", file=sys.stderr)
-        sys.exit(1)
-
-    # ── Print results ─────────────────────────────────────────────────────────
-    print()
-    print(f"  {bold('Query:')} {query_text}")
-    model_name = os.environ.get("EMBEDDING_MODEL", "nomic-embed-text")
-    print(f"  {dim(f'collection={args.collection}  model={model_name}  v{__version__}')}")
-    print()
-
-    if not hits:
-        print(dim("  No results found."))
-        print()
-        sys.exit(0)
-
-    for rank, hit in enumerate(hits, 1):
-        print(_format_result(rank, hit, args.show_text, args.width))
-        print()
+    client = QdrantClient(host=host, port=port)
+
+    if not args.serve:
+        query_text = " ".join(args.query)
+        try:
+            hits = _search(client, embedder, args, query_text)
+        except Exception as exc:
+            print(f"Search error: {exc}", file=sys.stderr)
+            sys.exit(1)
+        _print_results(args, query_text, hits)
+        return
+
+    interactive = sys.stdin.isatty()
+    while True:
+        if interactive:
+            print(bold("query> "), end="", flush=True)
+        line = sys.stdin.readline()
+        if not line:
+            break
+        query_text = line.strip()
+        if not query_text:
+            continue
+        try:
+            hits = _search(client, embedder, args, query_text)
+        except Exception as exc:
+            print(f"Search error: {exc}", file=sys.stderr)
+            continue
+        _print_results(args, query_text, hits)
 
 
 if __name__ == "__main__":
@@ -2,33 +2,51 @@
 Qdrant vector store wrapper.
 
 Each wiki page's chunks are stored as points in a single collection.
-Re-running the ingestion for a page first deletes its old points so the
-collection stays consistent (no stale chunks after a page is edited or
-deleted).
+Point IDs are derived from (page_id, chunk position), so re-ingesting a
+page overwrites its points in place; afterwards only points the new
+version no longer has (e.g. trailing chunks when a page shrinks) are
+deleted, keeping the collection consistent without a full delete first.
 
 Payload indexes are created on filterable fields (page_id, tags, page_path,
 content_hash) so that filtered vector search and delete-by-filter are fast.
 """
 
 import logging
-import uuid
+from collections.abc import Iterable
 from typing import Optional
 
+import numpy as np
+from grpc import RpcError
 from qdrant_client import QdrantClient
 from qdrant_client.http.exceptions import UnexpectedResponse
 from qdrant_client.models import (
     Distance,
     FieldCondition,
     Filter,
+    HasIdCondition,
     MatchValue,
     PayloadSchemaType,
-    PointStruct,
     ScrollResult,
     VectorParams,
 )
 
 logger = logging.getLogger(__name__)
 
+# Errors raised by qdrant-client for a failed request, over REST and gRPC.
+_QDRANT_ERRORS = (UnexpectedResponse, RpcError)
+
+# Point ID = page_id * _MAX_CHUNKS_PER_PAGE + chunk position.
+_MAX_CHUNKS_PER_PAGE = 100_000
+
+
+def _point_ids(page_id: int, count: int) -> list[int]:
+    if count > _MAX_CHUNKS_PER_PAGE:
+        raise ValueError(
+            f"Page {page_id} has {count} chunks; at most {_MAX_CHUNKS_PER_PAGE} are supported"
+        )
+    base = page_id * _MAX_CHUNKS_PER_PAGE
+    return list(range(base, base + count))
+
 
 class VectorStore:
     def __init__(
@@ -37,11 +55,16 @@ class VectorStore:
         port: int,
         collection: str,
         vector_size: int,
+        grpc_port: int = 6334,
+        prefer_grpc: bool = True,
     ):
+        # Over gRPC, qdrant-client sends float32 vectors as packed bytes
+        # rather than JSON number arrays.
         self._client = QdrantClient(
             host=host,
             port=port,
-            prefer_grpc=False,
+            grpc_port=grpc_port,
+            prefer_grpc=prefer_grpc,
         )
         self._collection = collection
         self._vector_size = vector_size
@@ -82,9 +105,42 @@ class VectorStore:
                     field_name=field_name,
                     field_schema=schema_type,
                 )
-            except UnexpectedResponse:
+            except _QDRANT_ERRORS:
                 pass  # index already exists
 
+    def _replace(
+        self,
+        owner: FieldCondition,
+        ids: list[int],
+        vectors: np.ndarray,
+        payloads: Iterable[dict],
+    ) -> None:
+        """
+        Upsert points *ids*, then drop any other point matching *owner*.
+
+        The upsert overwrites existing points in place, so the follow-up
+        delete only touches leftovers: trailing chunks of a page that got
+        shorter, or points written by older versions with random IDs.
+        """
+        self._client.upload_collection(
+            collection_name=self._collection,
+            vectors=np.asarray(vectors, dtype=np.float32),
+            payload=payloads,
+            ids=ids,
+            batch_size=256,
+            wait=True,
+        )
+        try:
+            self._client.delete(
+                collection_name=self._collection,
+                points_selector=Filter(
+                    must=[owner],
+                    must_not=[HasIdCondition(has_id=ids)],
+                ),
+            )
+        except _QDRANT_ERRORS as exc:
+            logger.warning("Could not delete stale chunks: %s", exc)
+
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
@@ -98,7 +154,7 @@ class VectorStore:
                     must=[FieldCondition(key="page_id", match=MatchValue(value=page_id))]
                 ),
             )
-        except UnexpectedResponse as exc:
+        except _QDRANT_ERRORS as exc:
             logger.warning("Could not delete page %d chunks: %s", page_id, exc)
 
     def get_page_updated_at(self, page_id: int) -> Optional[str]:
@@ -123,31 +179,30 @@ class VectorStore:
     def upsert_page_chunks(
         self,
         page_id: int,
-        vectors: list[list[float]],
+        vectors: np.ndarray,
         payloads: list[dict],
+        shared_payload: Optional[dict] = None,
     ) -> None:
         """
         Replace all stored chunks for *page_id* with the new vectors.
+
+        *shared_payload* holds page-level fields common to every chunk; it
+        is merged into each per-chunk payload only as points are uploaded.
         """
         assert len(vectors) == len(payloads), "vectors and payloads must have the same length"
 
-        self.delete_page(page_id)
-
-        points = [
-            PointStruct(
-                id=str(uuid.uuid4()),
-                vector=vec,
-                payload={**payload, "page_id": page_id},
-            )
-            for vec, payload in zip(vectors, payloads)
-        ]
-
-        self._client.upsert(collection_name=self._collection, points=points)
-        logger.info("Stored %d chunks for page %d", len(points), page_id)
+        shared = {**(shared_payload or {}), "page_id": page_id}
+        self._replace(
+            FieldCondition(key="page_id", match=MatchValue(value=page_id)),
+            _point_ids(page_id, len(payloads)),
+            vectors,
+            ({**shared, **payload} for payload in payloads),
+        )
+        logger.info("Stored %d chunks for page %d", len(payloads), page_id)
 
     def upsert_meta_chunks(
         self,
-        vectors: list[list[float]],
+        vectors: np.ndarray,
         payloads: list[dict],
     ) -> None:
         """
@@ -155,28 +210,13 @@ class VectorStore:
 
         Metadata chunks have page_id=0 so they don't collide with real pages.
         """
-        # Delete old meta chunks
-        try:
-            self._client.delete(
-                collection_name=self._collection,
-                points_selector=Filter(
-                    must=[FieldCondition(key="is_meta", match=MatchValue(value="true"))]
-                ),
-            )
-        except UnexpectedResponse:
-            pass
-
-        points = [
-            PointStruct(
-                id=str(uuid.uuid4()),
-                vector=vec,
-                payload={**payload, "page_id": 0, "is_meta": "true"},
-            )
-            for vec, payload in zip(vectors, payloads)
-        ]
-
-        self._client.upsert(collection_name=self._collection, points=points)
-        logger.info("Stored %d wiki metadata chunks", len(points))
+        self._replace(
+            FieldCondition(key="is_meta", match=MatchValue(value="true")),
+            _point_ids(0, len(payloads)),
+            vectors,
+            ({**payload, "page_id": 0, "is_meta": "true"} for payload in payloads),
+        )
+        logger.info("Stored %d wiki metadata chunks", len(payloads))
 
     def collection_info(self) -> dict:
         info = self._client.get_collection(self._collection)
@@ -6,22 +6,38 @@ Targets Wiki.js 2.x.
 The GraphQL pages.single resolver enforces its own permission layer that
 can block guest access even when pages are publicly visible in the browser.
 When that happens (error code 6013 / PageViewForbidden) we fall back to
-fetching the rendered HTML directly and parsing it with BeautifulSoup.
+fetching the rendered HTML directly and parsing it with lxml (BeautifulSoup
+for markup lxml cannot parse).
 
 Priority order for page content:
   1. GraphQL API  (returns clean markdown/raw content + full metadata)
-  2. HTML scrape  (returns rendered HTML, converted to plain text)
+  2. HTML scrape  (returns rendered HTML, converted to markdown)
+
+An optional SQLite cache (cache_path) keeps fetched pages keyed by
+(id, updatedAt) so unchanged pages are never downloaded twice.
 """
 
+import asyncio
 import logging
+import random
+import sqlite3
 import time
-from typing import Optional
+from functools import lru_cache, partial
+from typing import Any, Awaitable, Callable, Hashable, Optional
 
 import httpx
+import lxml.html
+import orjson
 from bs4 import BeautifulSoup
+from lxml import etree
+
+from http_retry import retry_after
 
 logger = logging.getLogger(__name__)
 
+# Wiki.js 2.x pages.list only filters by tags, locale, creator and author;
+# it has no published/private arguments, so list_public_pages() filters on
+# isPublished / isPrivate after the fact.
 _LIST_PAGES_QUERY = """
 query {
   pages {
@@ -31,45 +47,429 @@ query {
       title
       isPublished
       isPrivate
-      contentType
       updatedAt
     }
   }
 }
 """
 
+# Field set shared by the single-page and batched page queries.  Every
+# field is used downstream (chunk text, payload metadata, wiki metadata
+# chunks); the id is omitted because callers already have it from the list.
+_PAGE_FIELDS = """
+fragment PageFields on Page {
+  path
+  title
+  content
+  description
+  contentType
+  tags {
+    tag
+  }
+  authorName
+  createdAt
+  updatedAt
+}
+"""
+
 _GET_PAGE_QUERY = """
 query GetPage($id: Int!) {
   pages {
     single(id: $id) {
-      id
-      path
-      title
-      content
-      description
-      contentType
-      tags {
-        tag
-      }
-      authorName
-      createdAt
-      updatedAt
+      ...PageFields
     }
   }
 }
-"""
+""" + _PAGE_FIELDS
+
+
+@lru_cache(maxsize=None)
+def _batch_query(count: int) -> str:
+    """
+    Build a query fetching *count* pages in one request.
+
+    Each page is an aliased ``single`` selection (g0, g1, …) bound to its
+    own variable ($id0, $id1, …), so results and errors can be mapped back
+    to the requested ids by alias.
+    """
+    params = ", ".join(f"$id{i}: Int!" for i in range(count))
+    fields = "\n".join(
+        f"    g{i}: single(id: $id{i}) {{ ...PageFields }}" for i in range(count)
+    )
+    return f"query GetPages({params}) {{\n  pages {{\n{fields}\n  }}\n}}\n" + _PAGE_FIELDS
+
+
+def _has_class(name: str) -> str:
+    """XPath predicate equivalent to the CSS class selector ``.name``."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
 
-# CSS selectors tried in order to find the main content element.
+# CSS selectors tried in order to find the main content element, each
+# paired with an equivalent XPath test on a candidate element.
 # Wiki.js 2.x renders content inside div.contents; the others are fallbacks
 # for customised themes or future versions.
 _CONTENT_SELECTORS = [
-    "div.contents",
-    "div#page-contents",
-    "div.page-content",
-    "main article",
-    "main",
+    ("div.contents",      f"self::div[{_has_class('contents')}]"),
+    ("div#page-contents", "self::div[@id='page-contents']"),
+    ("div.page-content",  f"self::div[{_has_class('page-content')}]"),
+    ("main article",      "self::article[ancestor::main]"),
+    ("main",              "self::main"),
 ]
 
+# All candidates are found in one pass over the tree, then ranked by the
+# first selector each one matches.
+_CONTENT_XPATH = etree.XPath(
+    "//*[" + " or ".join(test for _, test in _CONTENT_SELECTORS) + "]"
+)
+_CONTENT_TESTS = [
+    (selector, etree.XPath(f"boolean({test})")) for selector, test in _CONTENT_SELECTORS
+]
+
+# Nav, header, footer, sidebar noise removed before extracting content.
+_NOISE_SELECTOR = "nav, header, footer, aside, script, style, [role=navigation]"
+_NOISE_XPATH = etree.XPath(
+    "//nav | //header | //footer | //aside | //script | //style | //*[@role='navigation']"
+)
+
+
+# Elements that start a new paragraph in the markdown produced from a
+# scraped page; anything else is treated as inline text.
+_BLOCK_TAGS = frozenset({
+    "address", "article", "aside", "blockquote", "dd", "details", "div", "dl",
+    "dt", "figcaption", "figure", "footer", "header", "hr", "li", "main",
+    "nav", "p", "section", "summary",
+})
+_HEADING_LEVELS = {f"h{n}": n for n in range(1, 7)}
+
+
+def _collapse(text: str) -> str:
+    return " ".join(text.split())
+
+
+def _inline_parts(el: lxml.html.HtmlElement, parts: list[str], skip: tuple = ()) -> None:
+    """Append the text under *el* to *parts*, leaving out child tags in *skip*."""
+    parts.append(el.text or "")
+    for child in el:
+        if not isinstance(child.tag, str) or child.tag in skip:
+            pass
+        elif child.tag == "img":
+            parts.append(child.get("alt") or "")
+        elif child.tag in _BLOCK_TAGS or child.tag == "br":
+            parts.append(" ")
+            _inline_parts(child, parts)
+            parts.append(" ")
+        else:
+            _inline_parts(child, parts)
+        parts.append(child.tail or "")
+
+
+def _inline_text(el: lxml.html.HtmlElement, skip: tuple = ()) -> str:
+    """Text of *el* and its descendants as one line; images give their alt text."""
+    parts: list[str] = []
+    _inline_parts(el, parts, skip)
+    return _collapse("".join(parts))
+
+
+def _markdown_list(el: lxml.html.HtmlElement, lines: list[str], depth: int = 0) -> None:
+    number = 0
+    for li in el:
+        if li.tag != "li":
+            continue
+        number += 1
+        marker = f"{number}." if el.tag == "ol" else "-"
+        text = _inline_text(li, skip=("ul", "ol"))
+        if text:
+            lines.append(f"{'  ' * depth}{marker} {text}")
+        for sub in li:
+            if sub.tag in ("ul", "ol"):
+                _markdown_list(sub, lines, depth + 1)
+
+
+def _markdown_table(el: lxml.html.HtmlElement) -> str:
+    rows = []
+    for tr in el.iter("tr"):
+        cells = [
+            _inline_text(cell).replace("|", "\\|") for cell in tr if cell.tag in ("td", "th")
+        ]
+        if cells:
+            rows.append(f"| {' | '.join(cells)} |")
+    if len(rows) > 1:
+        # Header separator, sized to the first row.
+        rows.insert(1, "|" + " --- |" * rows[0].count(" | ") + " --- |")
+    return "\n".join(rows)
+
+
+def _markdown_blocks(el: lxml.html.HtmlElement, blocks: list[str]) -> None:
+    """
+    Append *el*'s content to *blocks* as markdown paragraphs.
+
+    Headings, lists, tables and preformatted text become their markdown
+    equivalents so the chunker can split sections and keep tables, ordered
+    lists and code whole; everything else is flattened to prose.
+    """
+    inline = [el.text or ""]
+
+    def _flush() -> None:
+        text = _collapse("".join(inline))
+        if text:
+            blocks.append(text)
+        inline.clear()
+
+    for child in el:
+        tag = child.tag if isinstance(child.tag, str) else None
+        if tag in _HEADING_LEVELS:
+            _flush()
+            text = _inline_text(child)
+            if text:
+                blocks.append(f"{'#' * _HEADING_LEVELS[tag]} {text}")
+        elif tag in ("ul", "ol"):
+            _flush()
+            lines: list[str] = []
+            _markdown_list(child, lines)
+            if lines:
+                blocks.append("\n".join(lines))
+        elif tag == "table":
+            _flush()
+            table = _markdown_table(child)
+            if table:
+                blocks.append(table)
+        elif tag == "pre":
+            _flush()
+            # Indented rather than fenced, so the chunker keeps it whole.
+            code = child.text_content().strip("\n")
+            if code.strip():
+                blocks.append("\n".join(f"    {line}" for line in code.splitlines()))
+        elif tag in _BLOCK_TAGS:
+            _flush()
+            _markdown_blocks(child, blocks)
+        elif tag == "img":
+            inline.append(child.get("alt") or "")
+        elif tag == "br":
+            inline.append(" ")
+        elif tag is not None:
+            _inline_parts(child, inline)
+        inline.append(child.tail or "")
+    _flush()
+
+
+def _html_parser(encoding: str) -> lxml.html.HTMLParser:
+    """
+    Incremental HTML parser for a response body in *encoding*.
+
+    Pass ``resp.encoding``: the Content-Type charset, or httpx's UTF-8
+    default when there isn't one.  Left to itself libxml2 assumes Latin-1
+    for a page without a ``<meta charset>`` and mangles UTF-8 text.  A
+    charset libxml2 doesn't recognise falls back to UTF-8 as well.
+    """
+    try:
+        return lxml.html.HTMLParser(encoding=encoding)
+    except LookupError:
+        logger.debug("  Unknown charset %r, decoding as UTF-8.", encoding)
+        return lxml.html.HTMLParser(encoding="utf-8")
+
+
+def _extract_content(root: Optional[lxml.html.HtmlElement], path: str) -> Optional[str]:
+    """Return the main content element under *root* as markdown, or None."""
+    if root is None:
+        return None
+
+    # drop_tree() rather than parent.remove() so text following a removed
+    # element (its tail) stays in the page.
+    for el in _NOISE_XPATH(root):
+        el.drop_tree()
+
+    content_el = None
+    best = len(_CONTENT_TESTS)
+    for el in _CONTENT_XPATH(root):
+        rank = next(i for i, (_, test) in enumerate(_CONTENT_TESTS) if test(el))
+        if rank < best:
+            content_el, best = el, rank
+            if rank == 0:
+                break
+
+    if content_el is not None:
+        logger.debug("  Found content via selector '%s'", _CONTENT_TESTS[best][0])
+
+    if content_el is None:
+        # Last resort: grab the full <body>
+        content_el = root.find("body")
+        logger.warning("  No content selector matched for %s; using <body>", path)
+
+    if content_el is None:
+        return None
+
+    blocks: list[str] = []
+    _markdown_blocks(content_el, blocks)
+    return "\n\n".join(blocks)
+
+
+def _extract_content_bs4(html: bytes, path: str) -> Optional[str]:
+    """BeautifulSoup version of _extract_content(), for markup lxml rejects."""
+    soup = BeautifulSoup(html, "html.parser")
+
+    for tag in soup.select(_NOISE_SELECTOR):
+        tag.decompose()
+
+    content_el = None
+    for selector, _ in _CONTENT_SELECTORS:
+        content_el = soup.select_one(selector)
+        if content_el:
+            logger.debug("  Found content via selector '%s'", selector)
+            break
+
+    if not content_el:
+        content_el = soup.body
+        logger.warning("  No content selector matched for %s; using <body>", path)
+
+    return str(content_el) if content_el else None
+
+
+class _PageCache:
+    """
+    On-disk SQLite cache of page responses.
+
+    Pages are keyed by (id, updatedAt) from the page list, so an edited page
+    misses and is refetched.  The page list itself is cached for *list_ttl*
+    seconds.  Payloads are stored as JSON.  Scraped pages also keep their
+    ETag / Last-Modified validators for conditional GETs.
+    """
+
+    def __init__(self, path: str, list_ttl: float = 60.0):
+        self.list_ttl = list_ttl
+        self._db = sqlite3.connect(path)
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS pages (
+                id         INTEGER PRIMARY KEY,
+                updated_at TEXT,
+                payload    BLOB
+            );
+            CREATE TABLE IF NOT EXISTS lists (
+                key        TEXT PRIMARY KEY,
+                fetched_at REAL,
+                payload    BLOB
+            );
+            CREATE TABLE IF NOT EXISTS scrapes (
+                url           TEXT PRIMARY KEY,
+                etag          TEXT,
+                last_modified TEXT,
+                content_type  TEXT,
+                content       TEXT
+            );
+            CREATE TABLE IF NOT EXISTS state (
+                key        TEXT PRIMARY KEY,
+                value      REAL
+            );
+            """
+        )
+
+    def get_page(self, page_id: int, updated_at: str) -> Optional[dict]:
+        row = self._db.execute(
+            "SELECT payload FROM pages WHERE id = ? AND updated_at = ?",
+            (page_id, updated_at),
+        ).fetchone()
+        return orjson.loads(row[0]) if row else None
+
+    def put_page(self, page_id: int, updated_at: str, page: dict) -> None:
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO pages (id, updated_at, payload) VALUES (?, ?, ?)",
+                (page_id, updated_at, orjson.dumps(page)),
+            )
+
+    def get_list(self, key: str) -> Optional[list]:
+        row = self._db.execute(
+            "SELECT payload FROM lists WHERE key = ? AND fetched_at > ?",
+            (key, time.time() - self.list_ttl),
+        ).fetchone()
+        return orjson.loads(row[0]) if row else None
+
+    def put_list(self, key: str, items: list) -> None:
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO lists (key, fetched_at, payload) VALUES (?, ?, ?)",
+                (key, time.time(), orjson.dumps(items)),
+            )
+
+    def get_scrape(self, url: str) -> Optional[tuple[str, str, str, str]]:
+        """Return (etag, last_modified, content_type, content) for a scraped URL."""
+        return self._db.execute(
+            "SELECT etag, last_modified, content_type, content FROM scrapes WHERE url = ?",
+            (url,),
+        ).fetchone()
+
+    def put_scrape(
+        self, url: str, etag: str, last_modified: str, content_type: str, content: str,
+    ) -> None:
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO scrapes "
+                "(url, etag, last_modified, content_type, content) VALUES (?, ?, ?, ?, ?)",
+                (url, etag, last_modified, content_type, content),
+            )
+
+    def get_state(self, key: str) -> Optional[float]:
+        row = self._db.execute("SELECT value FROM state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def put_state(self, key: str, value: float) -> None:
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)", (key, value),
+            )
+
+    def close(self) -> None:
+        self._db.close()
+
+
+class _TokenBucket:
+    """
+    Adaptive client-side rate limit for requests to one host.
+
+    Each request takes a token; tokens refill at *rate* per second up to a
+    burst of one second's worth at the current rate, so a lowered rate
+    (learned or restored) also limits bursts.  The rate creeps up 2% on
+    every success (to *max_rate*), halves on a 429 and pauses refills until
+    the server's Retry-After has passed, so concurrent requests back off
+    together instead of all retrying into the same limit.
+    """
+
+    def __init__(self, rate: float, max_rate: float):
+        self.rate = rate
+        self.max_rate = max_rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    @property
+    def capacity(self) -> float:
+        return max(1.0, self.rate)
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def on_success(self) -> None:
+        self.rate = min(self.max_rate, self.rate * 1.02)
+
+    def on_throttle(self, retry_after: float = 0.0) -> None:
+        self.rate = max(0.1, self.rate * 0.5)
+        self._tokens = 0.0
+        self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+        # Refill from the end of the pause, not from the last acquire.
+        self._updated = self._paused_until
+
 
 class WikiClientError(Exception):
     pass
@@ -88,117 +488,225 @@ class WikiClient:
         timeout: float = 30.0,
         retry_delay: float = 2.0,
         max_retries: int = 3,
+        max_delay: float = 30.0,
+        jitter: float = 0.5,
+        max_connections: int = 64,
+        max_keepalive_connections: int = 32,
+        cache_path: Optional[str] = None,
+        list_ttl: float = 60.0,
+        rate_limit: float = 50.0,
     ):
         self.base_url = base_url.rstrip("/")
         self.graphql_url = f"{self.base_url}/graphql"
         self.retry_delay = retry_delay
         self.max_retries = max_retries
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self._cache = _PageCache(cache_path, list_ttl) if cache_path else None
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+
+        # Requests per second to the wiki, learned from 429s.  With a cache
+        # the learned rate carries over to the next run.
+        self._rate_key = f"rate:{httpx.URL(self.base_url).host}"
+        rate = self._cache.get_state(self._rate_key) if self._cache else None
+        self._bucket = _TokenBucket(min(rate or rate_limit, rate_limit), max_rate=rate_limit)
 
         headers = {"Content-Type": "application/json"}
         if api_key:
             headers["Authorization"] = f"Bearer {api_key}"
 
-        self._client = httpx.Client(headers=headers, timeout=timeout, follow_redirects=True)
+        # HTTP/2 lets concurrent requests share one TLS session; idle
+        # connections are kept warm between batches rather than re-dialled.
+        # httpx advertises brotli in Accept-Encoding when the brotli extra
+        # is installed (see requirements.txt), alongside gzip and deflate.
+        self._client = httpx.AsyncClient(
+            headers=headers,
+            timeout=timeout,
+            follow_redirects=True,
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=60.0,
+            ),
+        )
 
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
 
-    def _query(self, query: str, variables: Optional[dict] = None) -> dict:
+    @staticmethod
+    def _is_forbidden(err: dict) -> bool:
+        code = (err.get("extensions") or {}).get("exception", {}).get("code")
+        msg  = (err.get("message") or "").lower()
+        return code == 6013 or "not authorized" in msg
+
+    def _backoff(self, attempt: int, resp: Optional[httpx.Response] = None) -> float:
+        """
+        Delay before retry *attempt*: capped exponential backoff with jitter,
+        so concurrent requests don't retry in lockstep, but never shorter
+        than the server's Retry-After.
+        """
+        delay = min(self.max_delay, self.retry_delay * 2 ** (attempt - 1))
+        delay = random.uniform(delay * (1 - self.jitter), delay)
+        if resp is not None:
+            delay = max(delay, retry_after(resp) or 0.0)
+        return delay
+
+    def _flight(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> asyncio.Future:
+        """
+        Return the task already fetching *key*, or start *fetch* as that
+        task, so concurrent requests for the same thing share one fetch.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return task
+
+    async def _singleflight(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Await the shared fetch for *key*; see _flight()."""
+        # Shielded so one caller being cancelled doesn't cancel the others.
+        return await asyncio.shield(self._flight(key, fetch))
+
+    def _observe(self, resp: httpx.Response) -> None:
+        """Log a response and feed its status back into the rate limiter."""
+        logger.debug(
+            "%s %s -> %d (content-encoding: %s)",
+            resp.request.method, resp.request.url, resp.status_code,
+            resp.headers.get("content-encoding", "identity"),
+        )
+        if resp.status_code == 429:
+            self._bucket.on_throttle(retry_after(resp) or 0.0)
+            logger.debug("Rate limited; now at %.1f requests/s.", self._bucket.rate)
+        elif resp.is_success:
+            self._bucket.on_success()
+
+    async def _post(self, query: str, variables: Optional[dict] = None) -> dict:
+        """POST a GraphQL request, retrying transient failures, and return the body."""
         payload: dict = {"query": query}
         if variables:
             payload["variables"] = variables
+        body = orjson.dumps(payload)
 
         for attempt in range(1, self.max_retries + 1):
             try:
-                resp = self._client.post(self.graphql_url, json=payload)
+                await self._bucket.acquire()
+                resp = await self._client.post(self.graphql_url, content=body)
+                self._observe(resp)
                 resp.raise_for_status()
-                data = resp.json()
-                if "errors" in data:
-                    errors = data["errors"]
-                    # Surface forbidden errors as a distinct exception type
-                    # so callers can decide whether to try a fallback.
-                    for err in errors:
-                        code = (err.get("extensions") or {}).get("exception", {}).get("code")
-                        msg  = (err.get("message") or "").lower()
-                        if code == 6013 or "not authorized" in msg:
-                            raise WikiPageForbiddenError(
-                                f"GraphQL error 6013 (PageViewForbidden): {errors}"
-                            )
-                    raise WikiClientError(f"GraphQL errors: {errors}")
-                return data["data"]
+                return orjson.loads(resp.content)
             except httpx.HTTPStatusError as exc:
                 if exc.response.status_code == 429 or exc.response.status_code >= 500:
                     if attempt < self.max_retries:
+                        delay = self._backoff(attempt, exc.response)
                         logger.warning(
                             "HTTP %s on attempt %d/%d, retrying in %.1fs…",
                             exc.response.status_code,
                             attempt,
                             self.max_retries,
-                            self.retry_delay,
+                            delay,
                         )
-                        time.sleep(self.retry_delay * attempt)
+                        await asyncio.sleep(delay)
                         continue
                 raise WikiClientError(str(exc)) from exc
-            except WikiPageForbiddenError:
-                raise  # don't retry auth failures
             except httpx.RequestError as exc:
                 if attempt < self.max_retries:
+                    delay = self._backoff(attempt)
                     logger.warning(
-                        "Request error on attempt %d/%d: %s", attempt, self.max_retries, exc
+                        "Request error on attempt %d/%d, retrying in %.1fs: %s",
+                        attempt, self.max_retries, delay, exc,
                     )
-                    time.sleep(self.retry_delay * attempt)
+                    await asyncio.sleep(delay)
                     continue
                 raise WikiClientError(str(exc)) from exc
 
         raise WikiClientError("Exceeded max retries")
 
-    def _scrape_page(self, path: str, meta: dict) -> Optional[dict]:
+    async def _query(self, query: str, variables: Optional[dict] = None) -> dict:
+        data = await self._post(query, variables)
+        if "errors" in data:
+            errors = data["errors"]
+            # Surface forbidden errors as a distinct exception type
+            # so callers can decide whether to try a fallback.
+            if any(self._is_forbidden(err) for err in errors):
+                raise WikiPageForbiddenError(
+                    f"GraphQL error 6013 (PageViewForbidden): {errors}"
+                )
+            raise WikiClientError(f"GraphQL errors: {errors}")
+        return data["data"]
+
+    async def _scrape_page(self, path: str, meta: dict) -> Optional[dict]:
         """
-        Fetch the rendered HTML for *path* and extract text content.
+        Fetch the rendered HTML for *path* and extract its content.
 
         Returns a page dict in the same shape as get_page() so callers
-        don't need a separate code path, with contentType set to "html".
+        don't need a separate code path.  Content is converted to markdown
+        while walking the parsed tree (contentType "clean-markdown", which
+        the chunker splits like markdown without re-cleaning it), or left as
+        HTML (contentType "html") when only BeautifulSoup could parse it.
         """
         url = f"{self.base_url}/{path.lstrip('/')}"
         logger.debug("  Falling back to HTML scrape: %s", url)
+
+        # Revalidate a previous scrape so an unchanged page comes back as a
+        # bodiless 304 instead of being downloaded and parsed again.
+        headers = {}
+        cached = self._cache.get_scrape(url) if self._cache else None
+        if cached:
+            etag, last_modified, _, _ = cached
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
         try:
-            resp = self._client.get(url)
-            resp.raise_for_status()
+            try:
+                # Feed the body to lxml as it arrives rather than holding the
+                # whole page as a decoded str first.
+                await self._bucket.acquire()
+                async with self._client.stream("GET", url, headers=headers) as resp:
+                    self._observe(resp)
+                    if resp.status_code == 304 and cached:
+                        logger.debug("  %s not modified, using cached content.", url)
+                        _, _, content_type, content = cached
+                        return self._scraped_page(path, meta, content, content_type)
+                    resp.raise_for_status()
+                    parser = _html_parser(resp.encoding)
+                    async for chunk in resp.aiter_bytes(65536):
+                        parser.feed(chunk)
+                    content = _extract_content(parser.close(), path)
+                    content_type = "clean-markdown"
+            except etree.LxmlError:
+                # lxml gave up on this markup; refetch it for BeautifulSoup.
+                await self._bucket.acquire()
+                resp = await self._client.get(url)
+                self._observe(resp)
+                resp.raise_for_status()
+                content = _extract_content_bs4(resp.content, path)
+                content_type = "html"
         except httpx.HTTPError as exc:
             raise WikiClientError(f"HTTP scrape failed for {url}: {exc}") from exc
 
-        soup = BeautifulSoup(resp.text, "html.parser")
+        etag = resp.headers.get("ETag")
+        last_modified = resp.headers.get("Last-Modified")
+        if self._cache and content is not None and (etag or last_modified):
+            self._cache.put_scrape(url, etag, last_modified, content_type, content)
 
-        # Remove nav, header, footer, sidebar noise before extracting text
-        for tag in soup.select("nav, header, footer, aside, script, style, [role=navigation]"):
-            tag.decompose()
-
-        content_el = None
-        for selector in _CONTENT_SELECTORS:
-            content_el = soup.select_one(selector)
-            if content_el:
-                logger.debug("  Found content via selector '%s'", selector)
-                break
-
-        if not content_el:
-            # Last resort: grab the full <body>
-            content_el = soup.body
-            logger.warning("  No content selector matched for %s; using <body>", path)
-
-        if not content_el:
+        if content is None:
             return None
+        return self._scraped_page(path, meta, content, content_type)
 
-        # Preserve paragraph structure for the chunker
-        html_content = str(content_el)
-
+    @staticmethod
+    def _scraped_page(path: str, meta: dict, content: str, content_type: str) -> dict:
         return {
             "id":          meta.get("id"),
             "path":        path,
             "title":       meta.get("title") or "",
-            "content":     html_content,
+            "content":     content,
             "description": "",
-            "contentType": "html",
+            "contentType": content_type,
             "tags":        [],
             "createdAt":   "",
             "updatedAt":   meta.get("updatedAt") or "",
@@ -208,38 +716,199 @@ class WikiClient:
     # Public API
     # ------------------------------------------------------------------
 
-    def list_public_pages(self) -> list[dict]:
+    async def list_public_pages(self) -> list[dict]:
         """Return metadata for all published, non-private pages."""
-        data = self._query(_LIST_PAGES_QUERY)
-        pages = data["pages"]["list"]
+        pages = self._cache.get_list("pages") if self._cache else None
+        if pages is None:
+            data = await self._singleflight("list", lambda: self._query(_LIST_PAGES_QUERY))
+            pages = data["pages"]["list"]
+            if self._cache:
+                self._cache.put_list("pages", pages)
         public = [p for p in pages if p.get("isPublished") and not p.get("isPrivate")]
         logger.info("Found %d public pages out of %d total", len(public), len(pages))
         return public
 
-    def get_page(self, page_id: int, meta: Optional[dict] = None) -> Optional[dict]:
+    async def get_page(self, page_id: int, meta: Optional[dict] = None) -> Optional[dict]:
         """
         Fetch full content for a single page.
 
         Tries the GraphQL API first.  If that returns a 6013 (PageViewForbidden)
         error and *meta* (with at least ``path``) is provided, falls back to
         scraping the rendered HTML.
+
+        With a cache configured, a page whose ``updatedAt`` in *meta* matches
+        the cached copy is returned without touching the network.  Concurrent
+        calls for the same page, here or in get_pages_batch(), share a single
+        request.
         """
+        page = await self._singleflight(("page", page_id), lambda: self._get_page(page_id, meta))
+        if isinstance(page, WikiClientError):
+            raise page
+        return page
+
+    async def _get_page(
+        self, page_id: int, meta: Optional[dict],
+    ) -> Optional[dict] | WikiClientError:
+        """get_page() without coalescing; failures are returned, not raised."""
         try:
-            data = self._query(_GET_PAGE_QUERY, {"id": page_id})
-            return data["pages"]["single"]
+            return await self._fetch_page(page_id, meta)
+        except WikiClientError as exc:
+            return exc
+
+    async def _fetch_page(self, page_id: int, meta: Optional[dict]) -> Optional[dict]:
+        updated_at = (meta or {}).get("updatedAt")
+        if self._cache and updated_at:
+            cached = self._cache.get_page(page_id, updated_at)
+            if cached is not None:
+                return cached
+
+        try:
+            data = await self._query(_GET_PAGE_QUERY, {"id": page_id})
+            page = data["pages"]["single"]
         except WikiPageForbiddenError:
             if meta and meta.get("path"):
                 logger.debug(
                     "  GraphQL access denied for page %d, trying HTML scrape.", page_id
                 )
-                return self._scrape_page(meta["path"], meta)
-            raise
+                page = await self._scrape_page(meta["path"], meta)
+            else:
+                raise
 
-    def close(self) -> None:
-        self._client.close()
+        if self._cache and updated_at and page:
+            self._cache.put_page(page_id, updated_at, page)
+        return page
+
+    async def _fetch_batch(self, metas: list[dict]) -> list[Optional[dict] | WikiClientError]:
+        """Fetch *metas* with one aliased GraphQL request; see get_pages_batch()."""
+        if not metas:
+            return []
+
+        variables = {f"id{i}": m["id"] for i, m in enumerate(metas)}
+        try:
+            body = await self._post(_batch_query(len(metas)), variables)
+        except WikiClientError as exc:
+            return [exc] * len(metas)
+
+        # Map per-alias errors (path ["pages", "gK"]) back to their page.
+        failed: dict[int, WikiClientError] = {}
+        for err in body.get("errors") or []:
+            path = err.get("path") or []
+            alias = path[1] if len(path) > 1 else ""
+            if not (alias.startswith("g") and alias[1:].isdigit()):
+                # Not tied to one page: the whole request failed.
+                return [WikiClientError(f"GraphQL errors: {body['errors']}")] * len(metas)
+            if self._is_forbidden(err):
+                failed[int(alias[1:])] = WikiPageForbiddenError(
+                    f"GraphQL error 6013 (PageViewForbidden): {err}"
+                )
+            else:
+                failed[int(alias[1:])] = WikiClientError(f"GraphQL errors: {[err]}")
+
+        pages = (body.get("data") or {}).get("pages") or {}
+        results: list[Optional[dict] | WikiClientError] = [
+            failed.get(i, pages.get(f"g{i}")) for i in range(len(metas))
+        ]
+
+        async def _scrape(i: int) -> None:
+            meta = metas[i]
+            logger.debug(
+                "  GraphQL access denied for page %d, trying HTML scrape.", meta["id"]
+            )
+            try:
+                results[i] = await self._scrape_page(meta["path"], meta)
+            except WikiClientError as exc:
+                results[i] = exc
+            except Exception as exc:
+                # One unparseable page mustn't sink the rest of the batch.
+                results[i] = WikiClientError(f"HTML scrape failed for page {meta['id']}: {exc!r}")
+
+        await asyncio.gather(*(
+            _scrape(i) for i, exc in failed.items()
+            if isinstance(exc, WikiPageForbiddenError) and metas[i].get("path")
+        ))
+        return results
+
+    async def get_pages_batch(self, metas: list[dict]) -> list[Optional[dict] | WikiClientError]:
+        """
+        Fetch several pages with a single aliased GraphQL request.
+
+        *metas* are entries from list_public_pages().  Results come back in
+        the same order.  A page the API refuses (6013) falls back to an HTML
+        scrape like get_page(); any other per-page failure is returned as a
+        WikiClientError in that page's slot.  Keep batches to a few dozen
+        pages so the query stays under Wiki.js' complexity limits.
+
+        Pages found in the cache (see get_page()) are left out of the request,
+        and so are pages another get_page() / get_pages_batch() call is
+        already fetching: those share the result of the request in flight.
+        """
+        results: list[Optional[dict] | WikiClientError] = [None] * len(metas)
+        misses: list[int] = []
+        for i, meta in enumerate(metas):
+            cached = None
+            if self._cache and meta.get("updatedAt"):
+                cached = self._cache.get_page(meta["id"], meta["updatedAt"])
+            if cached is None:
+                misses.append(i)
+            else:
+                results[i] = cached
+
+        # Register a task per page id before posting, so concurrent callers
+        # asking for any of these pages join this request.
+        owned: dict[int, dict] = {}
+        for i in misses:
+            key = ("page", metas[i]["id"])
+            if key not in self._inflight and metas[i]["id"] not in owned:
+                owned[metas[i]["id"]] = metas[i]
+        if owned:
+            batch = asyncio.ensure_future(self._fetch_batch(list(owned.values())))
+
+            async def _slot(j: int) -> Optional[dict] | WikiClientError:
+                return (await batch)[j]
+
+            for j, page_id in enumerate(owned):
+                self._flight(("page", page_id), partial(_slot, j))
+
+        tasks = [self._inflight[("page", metas[i]["id"])] for i in misses]
+        fetched = await asyncio.gather(*(asyncio.shield(t) for t in tasks))
+        for i, page in zip(misses, fetched):
+            results[i] = page
+            if self._cache and isinstance(page, dict) and metas[i].get("updatedAt"):
+                self._cache.put_page(metas[i]["id"], metas[i]["updatedAt"], page)
+        return results
+
+    async def get_pages_bulk(
+        self,
+        metas: list[dict],
+        concurrency: int = 16,
+        batch_size: int = 20,
+    ) -> list[Optional[dict] | WikiClientError]:
+        """
+        Fetch many pages in batches of *batch_size*, at most *concurrency*
+        batch requests in flight at a time.
+
+        Results come back in the same order as *metas*; a page that failed
+        is returned as its WikiClientError instead of aborting the others.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _fetch(batch: list[dict]) -> list[Optional[dict] | WikiClientError]:
+            async with semaphore:
+                return await self.get_pages_batch(batch)
+
+        batches = await asyncio.gather(*(
+            _fetch(metas[i:i + batch_size]) for i in range(0, len(metas), batch_size)
+        ))
+        return [page for batch in batches for page in batch]
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+        if self._cache:
+            self._cache.put_state(self._rate_key, self._bucket.rate)
+            self._cache.close()
 
-    def __enter__(self):
+    async def __aenter__(self):
         return self
 
-    def __exit__(self, *_):
-        self.close()
+    async def __aexit__(self, *_):
+        await self.aclose()
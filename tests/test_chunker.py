@@ -0,0 +1,22 @@
+from chunker import _clean_markdown, chunk_page
+
+
+def test_linked_image_keeps_alt_text():
+    assert _clean_markdown("[![logo](logo.png)](/home)") == "logo"
+    assert _clean_markdown("See [![Build](b.svg)](https://ci/job) ok") == "See Build ok"
+
+
+def test_linked_image_in_header():
+    chunks = chunk_page("## Status [![Build](b.svg)](https://ci/job)\n\nAll green.")
+    assert chunks[0].section == "Status Build"
+
+
+def test_blank_lines_collapsed_after_removal():
+    assert _clean_markdown("para\n\n![](img.png)\n\npara") == "para\n\npara"
+
+
+def test_clean_markdown_content_keeps_angle_brackets():
+    content = "## Code\n\n    std::vector<int> v;"
+    chunks = chunk_page(content, content_type="clean-markdown")
+    assert chunks[0].section == "Code"
+    assert "std::vector<int> v;" in chunks[0].text
@@ -0,0 +1,18 @@
+import httpx
+
+from http_retry import retry_after
+
+
+def test_retry_after_seconds():
+    assert retry_after(httpx.Response(429, headers={"Retry-After": "7"})) == 7.0
+
+
+def test_retry_after_naive_http_date():
+    # "-0000" parses to a naive datetime; it must not raise TypeError.
+    resp = httpx.Response(429, headers={"Retry-After": "Wed, 21 Oct 2015 07:28:00 -0000"})
+    assert retry_after(resp) == 0.0
+
+
+def test_retry_after_missing_or_garbage():
+    assert retry_after(httpx.Response(429)) is None
+    assert retry_after(httpx.Response(429, headers={"Retry-After": "soon"})) is None
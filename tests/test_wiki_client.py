@@ -0,0 +1,259 @@
+import asyncio
+import re
+
+import httpx
+import lxml.html
+import orjson
+import pytest
+
+import wiki_client
+from wiki_client import WikiClient, WikiClientError
+
+_ALIAS_RE = re.compile(r"(g\d+): single\(id: \$(id\d+)\)")
+
+_HTML = (
+    b"<html><body><main><div class='contents'>"
+    b"<h2>Scraped</h2><p>Visible to guests</p>"
+    b"</div></main></body></html>"
+)
+
+
+def _meta(page_id: int) -> dict:
+    return {
+        "id": page_id, "path": f"p/{page_id}", "title": f"Page {page_id}",
+        "updatedAt": "2024-01-01",
+    }
+
+
+def _page(page_id: int) -> dict:
+    return {
+        "id": page_id, "path": f"p/{page_id}", "title": f"Page {page_id}",
+        "content": f"# Page {page_id}", "description": "", "contentType": "markdown",
+        "tags": [], "authorName": "", "createdAt": "", "updatedAt": "2024-01-01",
+    }
+
+
+def _forbidden(alias: str) -> dict:
+    return {
+        "message": "You are not authorized to view this page.",
+        "path": ["pages", alias],
+        "extensions": {"exception": {"code": 6013}},
+    }
+
+
+class FakeWiki:
+    """
+    MockTransport handler answering single and aliased page queries.
+
+    Pages in *forbidden* fail with 6013, pages in *broken* with some other
+    per-alias error; any other path is served as rendered HTML.
+    """
+
+    def __init__(self, forbidden=(), broken=()):
+        self.forbidden = set(forbidden)
+        self.broken = set(broken)
+        self.posts: list[dict] = []
+        self.gets: list[str] = []
+        self.error: dict | None = None   # set to fail the whole request
+        self.status = 200
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path != "/graphql":
+            self.gets.append(request.url.path)
+            return httpx.Response(200, content=_HTML, headers={"Content-Type": "text/html"})
+
+        body = orjson.loads(request.content)
+        self.posts.append(body)
+        await self.release.wait()
+        if self.status != 200:
+            return httpx.Response(self.status)
+        if self.error:
+            return httpx.Response(200, json={"data": None, "errors": [self.error]})
+
+        variables = body.get("variables") or {}
+        aliases = _ALIAS_RE.findall(body["query"]) or [("single", "id")]
+        data, errors = {}, []
+        for alias, var in aliases:
+            page_id = variables[var]
+            if page_id in self.forbidden:
+                data[alias] = None
+                errors.append(_forbidden(alias))
+            elif page_id in self.broken:
+                data[alias] = None
+                errors.append({"message": "boom", "path": ["pages", alias]})
+            else:
+                data[alias] = _page(page_id)
+        out = {"data": {"pages": data}}
+        if errors:
+            out["errors"] = errors
+        return httpx.Response(200, json=out)
+
+
+@pytest.fixture
+def make_client(monkeypatch):
+    """Build a WikiClient whose requests go to the given FakeWiki."""
+    real_client = httpx.AsyncClient
+
+    def _make(wiki: FakeWiki, **kwargs) -> WikiClient:
+        def _client(*args, **client_kwargs):
+            client_kwargs.pop("http2", None)
+            return real_client(*args, transport=httpx.MockTransport(wiki), **client_kwargs)
+
+        monkeypatch.setattr(wiki_client.httpx, "AsyncClient", _client)
+        return WikiClient("http://wiki", max_retries=1, **kwargs)
+
+    return _make
+
+
+def test_batch_maps_alias_errors_to_pages(make_client):
+    wiki = FakeWiki(broken={2})
+
+    async def main():
+        async with make_client(wiki) as client:
+            return await client.get_pages_batch([_meta(1), _meta(2), _meta(3)])
+
+    first, second, third = asyncio.run(main())
+    assert len(wiki.posts) == 1
+    assert first["id"] == 1 and third["id"] == 3
+    assert isinstance(second, WikiClientError) and "boom" in str(second)
+
+
+def test_batch_wide_error_fails_every_slot(make_client):
+    wiki = FakeWiki()
+    wiki.error = {"message": "Query is too complex"}   # no alias path
+
+    async def main():
+        async with make_client(wiki) as client:
+            return await client.get_pages_batch([_meta(1), _meta(2)])
+
+    results = asyncio.run(main())
+    assert all(isinstance(r, WikiClientError) for r in results)
+
+
+def test_failed_post_fails_every_slot(make_client):
+    wiki = FakeWiki()
+    wiki.status = 500
+
+    async def main():
+        async with make_client(wiki) as client:
+            return await client.get_pages_batch([_meta(1), _meta(2)])
+
+    results = asyncio.run(main())
+    assert all(isinstance(r, WikiClientError) for r in results)
+
+
+def test_forbidden_page_is_scraped_in_its_slot(make_client):
+    wiki = FakeWiki(forbidden={2})
+
+    async def main():
+        async with make_client(wiki) as client:
+            return await client.get_pages_batch([_meta(1), _meta(2), _meta(3)])
+
+    first, second, third = asyncio.run(main())
+    assert wiki.gets == ["/p/2"]
+    assert first["contentType"] == third["contentType"] == "markdown"
+    assert second["id"] == 2
+    assert second["contentType"] == "clean-markdown"
+    assert second["content"] == "## Scraped\n\nVisible to guests"
+
+
+def test_get_page_joins_batch_in_flight(make_client):
+    wiki = FakeWiki()
+    wiki.release.clear()
+
+    async def main():
+        async with make_client(wiki) as client:
+            batch = asyncio.ensure_future(client.get_pages_batch([_meta(1), _meta(2)]))
+            single = asyncio.ensure_future(client.get_page(1, _meta(1)))
+            await asyncio.sleep(0.05)
+            wiki.release.set()
+            return await batch, await single
+
+    (first, _), single = asyncio.run(main())
+    assert len(wiki.posts) == 1
+    assert single == first
+
+
+def test_batch_joins_get_page_in_flight(make_client):
+    wiki = FakeWiki()
+    wiki.release.clear()
+
+    async def main():
+        async with make_client(wiki) as client:
+            single = asyncio.ensure_future(client.get_page(1, _meta(1)))
+            await asyncio.sleep(0.05)
+            batch = asyncio.ensure_future(client.get_pages_batch([_meta(1), _meta(2)]))
+            await asyncio.sleep(0.05)
+            wiki.release.set()
+            return await single, await batch
+
+    single, (first, second) = asyncio.run(main())
+    # The batch only asked for the page nobody was fetching yet.
+    assert len(wiki.posts) == 2
+    assert list(wiki.posts[1]["variables"].values()) == [2]
+    assert first == single and second["id"] == 2
+
+
+def test_cached_pages_skip_the_request(make_client, tmp_path):
+    wiki = FakeWiki()
+    cache = str(tmp_path / "cache.db")
+
+    async def fetch(metas):
+        async with make_client(wiki, cache_path=cache) as client:
+            return await client.get_pages_batch(metas)
+
+    asyncio.run(fetch([_meta(1), _meta(2)]))
+    assert len(wiki.posts) == 1
+
+    # Same updatedAt: served from the cache without a POST.
+    results = asyncio.run(fetch([_meta(1), _meta(2)]))
+    assert len(wiki.posts) == 1
+    assert [r["id"] for r in results] == [1, 2]
+
+    # Only the page that changed is requested again.
+    changed = dict(_meta(2), updatedAt="2024-02-01")
+    asyncio.run(fetch([_meta(1), changed]))
+    assert len(wiki.posts) == 2
+    assert list(wiki.posts[1]["variables"].values()) == [2]
+
+
+def _markdown(html: str) -> str:
+    return wiki_client._extract_content(lxml.html.fromstring(html), "p")
+
+
+def test_scrape_headings_and_paragraphs():
+    html = "<main><h1>Title</h1><p>Intro <b>text</b></p><h3>Sub <i>part</i></h3><p>More</p></main>"
+    assert _markdown(html) == "# Title\n\nIntro text\n\n### Sub part\n\nMore"
+
+
+def test_scrape_nested_lists():
+    html = (
+        "<main><ol><li>First<ul><li>inner a</li><li>inner b</li></ul></li>"
+        "<li>Second</li></ol></main>"
+    )
+    assert _markdown(html) == "1. First\n  - inner a\n  - inner b\n2. Second"
+
+
+def test_scrape_table_escapes_pipes():
+    html = (
+        "<main><table><tr><th>Flag</th><th>Meaning</th></tr>"
+        "<tr><td><code>a|b</code></td><td>either</td></tr></table></main>"
+    )
+    assert _markdown(html) == "| Flag | Meaning |\n| --- | --- |\n| a\\|b | either |"
+
+
+def test_scrape_pre_is_indented():
+    html = "<main><p>Run:</p><pre>make\n  make install\n</pre></main>"
+    assert _markdown(html) == "Run:\n\n    make\n      make install"
+
+
+def test_scrape_keeps_text_after_dropped_noise():
+    html = "<main><p>Before <script>track()</script>after</p><nav>menu</nav>tail</main>"
+    assert _markdown(html) == "Before after\n\ntail"
+
+
+def test_scrape_image_alt_text():
+    html = '<main><p>See <img src="d.png" alt="the diagram"> below</p></main>'
+    assert _markdown(html) == "See the diagram below"